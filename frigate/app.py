@@ -182,6 +182,7 @@ class FrigateApp:
                     model_shape,
                     "cpu",
                     detector.num_threads,
+                    detector.cpu_id,
                 )
             if detector.type == DetectorTypeEnum.edgetpu:
                 self.detectors[name] = EdgeTPUProcess(
@@ -192,6 +193,7 @@ class FrigateApp:
                     model_shape,
                     detector.device,
                     detector.num_threads,
+                    detector.cpu_id,
                 )
 
     def start_detected_frames_processor(self):
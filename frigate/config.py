@@ -43,6 +43,9 @@ class DetectorConfig(FrigateBaseModel):
     type: DetectorTypeEnum = Field(default=DetectorTypeEnum.cpu, title="Detector Type")
     device: str = Field(default="usb", title="Device Type")
     num_threads: int = Field(default=3, title="Number of detection threads")
+    cpu_id: Optional[int] = Field(
+        title="CPU core to pin the detection process to", ge=0
+    )
 
 
 class MqttConfig(FrigateBaseModel):
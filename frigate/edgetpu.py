@@ -1,10 +1,10 @@
-import datetime
 import logging
 import multiprocessing as mp
 import os
 import queue
 import signal
 import threading
+import time
 from abc import ABC, abstractmethod
 from typing import Dict
 
@@ -13,7 +13,7 @@ import tflite_runtime.interpreter as tflite
 from setproctitle import setproctitle
 from tflite_runtime.interpreter import load_delegate
 
-from frigate.util import EventsPerSecond, SharedMemoryFrameManager, listen
+from frigate.util import EventCounter, SharedMemoryFrameManager, listen
 
 logger = logging.getLogger(__name__)
 
@@ -46,7 +46,7 @@ class ObjectDetector(ABC):
 
 class LocalObjectDetector(ObjectDetector):
     def __init__(self, tf_device=None, model_path=None, num_threads=3, labels=None):
-        self.fps = EventsPerSecond()
+        self.fps = EventCounter()
         if labels is None:
             self.labels = {}
         else:
@@ -85,14 +85,33 @@ class LocalObjectDetector(ObjectDetector):
         self.tensor_input_details = self.interpreter.get_input_details()
         self.tensor_output_details = self.interpreter.get_output_details()
 
+        # resolve the tensor accessors once instead of on every inference
+        self._input_index = self.tensor_input_details[0]["index"]
+        self._get_boxes = self.interpreter.tensor(
+            self.tensor_output_details[0]["index"]
+        )
+        self._get_class_ids = self.interpreter.tensor(
+            self.tensor_output_details[1]["index"]
+        )
+        self._get_scores = self.interpreter.tensor(
+            self.tensor_output_details[2]["index"]
+        )
+        self._get_count = self.interpreter.tensor(
+            self.tensor_output_details[3]["index"]
+        )
+
+        # reused between calls, callers must copy the result out before the next call
+        self._detections = np.zeros((20, 6), np.float32)
+
     def detect(self, tensor_input, threshold=0.4):
         detections = []
 
         raw_detections = self.detect_raw(tensor_input)
 
-        for d in raw_detections:
-            if d[1] < threshold:
-                break
+        # scores are sorted descending, so find the cutoff without a python loop
+        count = int(np.searchsorted(-raw_detections[:, 1], -threshold, side="right"))
+
+        for d in raw_detections[:count]:
             detections.append(
                 (self.labels[int(d[0])], float(d[1]), (d[2], d[3], d[4], d[5]))
             )
@@ -100,29 +119,21 @@ class LocalObjectDetector(ObjectDetector):
         return detections
 
     def detect_raw(self, tensor_input):
-        self.interpreter.set_tensor(self.tensor_input_details[0]["index"], tensor_input)
+        self.interpreter.set_tensor(self._input_index, tensor_input)
         self.interpreter.invoke()
 
-        boxes = self.interpreter.tensor(self.tensor_output_details[0]["index"])()[0]
-        class_ids = self.interpreter.tensor(self.tensor_output_details[1]["index"])()[0]
-        scores = self.interpreter.tensor(self.tensor_output_details[2]["index"])()[0]
-        count = int(
-            self.interpreter.tensor(self.tensor_output_details[3]["index"])()[0]
-        )
+        boxes = self._get_boxes()[0]
+        class_ids = self._get_class_ids()[0]
+        scores = self._get_scores()[0]
+        count = int(self._get_count()[0])
 
-        detections = np.zeros((20, 6), np.float32)
+        detections = self._detections
+        detections.fill(0)
 
-        for i in range(count):
-            if scores[i] < 0.4 or i == 20:
-                break
-            detections[i] = [
-                class_ids[i],
-                float(scores[i]),
-                boxes[i][0],
-                boxes[i][1],
-                boxes[i][2],
-                boxes[i][3],
-            ]
+        idx = np.flatnonzero(scores[: min(count, 20)] >= 0.4)
+        detections[: idx.size, 0] = class_ids[idx]
+        detections[: idx.size, 1] = scores[idx]
+        detections[: idx.size, 2:6] = boxes[idx]
 
         return detections
 
@@ -137,6 +148,7 @@ def run_detector(
     model_shape,
     tf_device,
     num_threads,
+    cpu_id,
 ):
     threading.current_thread().name = f"detector:{name}"
     logger = logging.getLogger(f"detector.{name}")
@@ -144,6 +156,20 @@ def run_detector(
     setproctitle(f"frigate.detector.{name}")
     listen()
 
+    if not cpu_id is None:
+        if tf_device == "cpu" and num_threads > 1:
+            logger.warning(
+                f"cpu_id is set, so all {num_threads} detection threads will share cpu {cpu_id}. Set num_threads to 1 or remove cpu_id."
+            )
+        try:
+            os.sched_setaffinity(0, {cpu_id})
+        except (OSError, ValueError) as e:
+            logger.warning(f"Unable to pin detection process to cpu {cpu_id}: {e}")
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(10))
+        except OSError as e:
+            logger.warning(f"Unable to set realtime priority for detection: {e}")
+
     stop_event = mp.Event()
 
     def receiveSignal(signalNumber, frame):
@@ -157,8 +183,11 @@ def run_detector(
         tf_device=tf_device, model_path=model_path, num_threads=num_threads
     )
 
+    # map the input and output buffers once per camera instead of once per frame
+    inputs = {}
     outputs = {}
     for name in out_events.keys():
+        inputs[name] = frame_manager.get(name, (1, model_shape[0], model_shape[1], 3))
         out_shm = mp.shared_memory.SharedMemory(name=f"out-{name}", create=False)
         out_np = np.ndarray((20, 6), dtype=np.float32, buffer=out_shm.buf)
         outputs[name] = {"shm": out_shm, "np": out_np}
@@ -168,17 +197,17 @@ def run_detector(
             connection_id = detection_queue.get(timeout=5)
         except queue.Empty:
             continue
-        input_frame = frame_manager.get(
-            connection_id, (1, model_shape[0], model_shape[1], 3)
-        )
+        input_frame = inputs.get(connection_id)
 
         if input_frame is None:
             continue
 
         # detect and send the output
-        start.value = datetime.datetime.now().timestamp()
+        # start stays wall clock time for the watchdog, duration is monotonic
+        start.value = time.time()
+        detect_start = time.monotonic()
         detections = object_detector.detect_raw(input_frame)
-        duration = datetime.datetime.now().timestamp() - start.value
+        duration = time.monotonic() - detect_start
         outputs[connection_id]["np"][:] = detections[:]
         out_events[connection_id].set()
         start.value = 0.0
@@ -196,6 +225,7 @@ class EdgeTPUProcess:
         model_shape,
         tf_device=None,
         num_threads=3,
+        cpu_id=None,
     ):
         self.name = name
         self.out_events = out_events
@@ -207,6 +237,7 @@ class EdgeTPUProcess:
         self.model_shape = model_shape
         self.tf_device = tf_device
         self.num_threads = num_threads
+        self.cpu_id = cpu_id
         self.start_or_restart()
 
     def stop(self):
@@ -235,6 +266,7 @@ class EdgeTPUProcess:
                 self.model_shape,
                 self.tf_device,
                 self.num_threads,
+                self.cpu_id,
             ),
         )
         self.detect_process.daemon = True
@@ -245,7 +277,7 @@ class RemoteObjectDetector:
     def __init__(self, name, labels, detection_queue, event, model_shape):
         self.labels = labels
         self.name = name
-        self.fps = EventsPerSecond()
+        self.fps = EventCounter()
         self.detection_queue = detection_queue
         self.event = event
         self.shm = mp.shared_memory.SharedMemory(name=self.name, create=False)
@@ -270,9 +302,10 @@ class RemoteObjectDetector:
         if result is None:
             return detections
 
-        for d in self.out_np_shm:
-            if d[1] < threshold:
-                break
+        # scores are sorted descending, so find the cutoff without a python loop
+        count = int(np.searchsorted(-self.out_np_shm[:, 1], -threshold, side="right"))
+
+        for d in self.out_np_shm[:count]:
             detections.append(
                 (self.labels[int(d[0])], float(d[1]), (d[2], d[3], d[4], d[5]))
             )
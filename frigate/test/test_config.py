@@ -35,6 +35,56 @@ class TestConfig(unittest.TestCase):
         assert "cpu" in runtime_config.detectors.keys()
         assert runtime_config.detectors["cpu"].type == DetectorTypeEnum.cpu
 
+    def test_detector_cpu_id(self):
+        config = {
+            "mqtt": {"host": "mqtt"},
+            "detectors": {"coral": {"type": "edgetpu", "cpu_id": 3}},
+            "cameras": {
+                "back": {
+                    "ffmpeg": {
+                        "inputs": [
+                            {"path": "rtsp://10.0.0.1:554/video", "roles": ["detect"]}
+                        ]
+                    },
+                    "detect": {
+                        "height": 1080,
+                        "width": 1920,
+                        "fps": 5,
+                    },
+                }
+            },
+        }
+        frigate_config = FrigateConfig(**config)
+        assert config == frigate_config.dict(exclude_unset=True)
+
+        runtime_config = frigate_config.runtime_config
+        assert runtime_config.detectors["coral"].cpu_id == 3
+
+    def test_detector_cpu_id_default(self):
+        runtime_config = FrigateConfig(**self.minimal).runtime_config
+        assert runtime_config.detectors["cpu"].cpu_id is None
+
+    def test_detector_negative_cpu_id(self):
+        config = {
+            "mqtt": {"host": "mqtt"},
+            "detectors": {"coral": {"type": "edgetpu", "cpu_id": -1}},
+            "cameras": {
+                "back": {
+                    "ffmpeg": {
+                        "inputs": [
+                            {"path": "rtsp://10.0.0.1:554/video", "roles": ["detect"]}
+                        ]
+                    },
+                    "detect": {
+                        "height": 1080,
+                        "width": 1920,
+                        "fps": 5,
+                    },
+                }
+            },
+        }
+        self.assertRaises(ValidationError, lambda: FrigateConfig(**config))
+
     def test_invalid_mqtt_config(self):
         config = {
             "mqtt": {"host": "mqtt", "user": "test"},
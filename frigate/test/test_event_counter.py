@@ -0,0 +1,44 @@
+from unittest import TestCase, main
+from unittest.mock import patch
+
+from frigate.util import EventCounter
+
+
+class TestEventCounter(TestCase):
+    def setUp(self):
+        self.now = 100.0
+        patcher = patch("frigate.util.time.monotonic", lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def run_for(self, counter, seconds, eps_rate):
+        # call update() eps_rate times a second and eps() once a second
+        for _ in range(seconds):
+            for _ in range(eps_rate):
+                counter.update()
+            self.now += 1
+            counter.eps()
+
+    def test_no_events(self):
+        counter = EventCounter()
+        assert counter.eps() == 0.0
+        self.now += 5
+        assert counter.eps() == 0.0
+
+    def test_steady_rate(self):
+        counter = EventCounter()
+        counter.start()
+        self.run_for(counter, 5, 4)
+        assert counter.eps() == 4.0
+
+    def test_window_drops_old_events(self):
+        counter = EventCounter()
+        counter.start()
+        self.run_for(counter, 20, 10)
+        self.run_for(counter, 20, 2)
+        assert counter.eps() == 2.0
+        assert len(counter._samples) <= 11
+
+
+if __name__ == "__main__":
+    main(verbosity=2)
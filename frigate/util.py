@@ -572,6 +572,38 @@ class EventsPerSecond:
         )
 
 
+class EventCounter:
+    """Cheaper EventsPerSecond for per-inference call sites.
+
+    update() only increments an int. The rate is derived in eps() from
+    (time, count) samples taken at most once per second.
+    """
+
+    def __init__(self):
+        self._count = 0
+        self._samples = collections.deque()
+
+    def start(self):
+        self._samples.append((time.monotonic(), self._count))
+
+    def update(self):
+        self._count += 1
+
+    def eps(self, last_n_seconds=10):
+        if not self._samples:
+            self.start()
+        now = time.monotonic()
+        if now - self._samples[-1][0] >= 1:
+            self._samples.append((now, self._count))
+        # keep the newest sample at or before the start of the window
+        while len(self._samples) > 1 and self._samples[1][0] <= now - last_n_seconds:
+            self._samples.popleft()
+        sample_time, sample_count = self._samples[0]
+        if now <= sample_time:
+            return 0.0
+        return (self._count - sample_count) / (now - sample_time)
+
+
 def print_stack(sig, frame):
     traceback.print_stack(frame)
 